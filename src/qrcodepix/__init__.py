@@ -26,7 +26,9 @@ __version__ = "1.1.1"
 __author__ = "Jean Carlos"
 __email__ = "jeancc.costa@gmail.com"
 
-from qrcodepix.core.payload import build_pix_payload
-from qrcodepix.generator.qr import save_qr_files
+from qrcodepix.core.payload import build_pix_payload, build_pix_payloads
+from qrcodepix.generator.qr import render_qr_bytes, save_qr_files
 
-__all__ = ["build_pix_payload", "save_qr_files", "__version__"]
+__all__ = [
+    "build_pix_payload", "build_pix_payloads", "render_qr_bytes", "save_qr_files", "__version__",
+]
@@ -1,5 +1,5 @@
 """CLI mínimo para gerar o QR PIX a partir de parâmetros.
-Uso: python -m pix_qr.cli.main --key ... --name ... --city ... [--amount 10.00] [--txid X]
+Uso: python -m pix_qr.cli.main --key ... --name ... --city ... [--amount 10.00] [--txid X] [--formats png svg]
 """
 import argparse
 from ..core.payload import build_pix_payload
@@ -20,6 +20,9 @@ def parse_args():
     parser.add_argument("--desc", required=False, help="Descrição (opcional)")
     parser.add_argument("--out", default="pix_qr",
                         help="Prefixo do arquivo de saída")
+    parser.add_argument("--formats", nargs="+", choices=["png", "svg"],
+                        default=["png", "svg"],
+                        help="Formatos gerados (padrão: png svg)")
     return parser.parse_args()
 
 
@@ -33,8 +36,9 @@ def main():
         txid=args.txid,
         description=args.desc,
     )
-    png, svg = save_qr_files(payload, filename_base=args.out)
-    print(f"Arquivos gerados: {png}, {svg}")
+    paths = save_qr_files(payload, filename_base=args.out,
+                          formats=tuple(args.formats))
+    print(f"Arquivos gerados: {', '.join(paths)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+"""Kernel CRC-16/CCITT compilado com Numba (opcional).
+Importado por `crc16.py` apenas com QRCODEPIX_NUMBA=1 e `numba` instalado.
+"""
+from numba import njit, types
+
+
+# `np.frombuffer` sobre `bytes` gera um array somente-leitura
+_U8_BUFFER = types.Array(types.uint8, 1, "C", readonly=True)
+
+
+@njit(types.uint16(types.int64, _U8_BUFFER), cache=True, nogil=True)
+def _crc16_nb(state, buf):
+    crc = state
+    for i in range(buf.shape[0]):
+        crc ^= buf[i] << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
@@ -1,23 +1,70 @@
 """CRC-16 para uso no payload EMV/BR Code.
 Implementação pequena, pura, com testes fáceis.
+Por padrão usa a tabela em Python. Com QRCODEPIX_NUMBA=1 (e `numba` instalado),
+usa um kernel compilado; importar o numba custa ~0,5 s, então fica desligado.
 """
+import os
 from typing import ByteString
 
+_crc16_nb = None
+if os.environ.get("QRCODEPIX_NUMBA") == "1":
+    try:
+        # numba primeiro: sem ele, não há motivo para importar o numpy
+        from ._crc16_numba import _crc16_nb
+        import numpy as np
+    except ImportError:
+        _crc16_nb = None
+
 
 POLY = 0x1021
 INIT = 0xFFFF
+CRC16_INIT = INIT
 
 
-def crc16_ccitt(data: ByteString) -> str:
-    """Calcula CRC-16/CCITT (polynomial 0x1021, inicial 0xFFFF).
-    Retorna string hex em MAIÚSCULAS com 4 caracteres.
-    """
-    crc = INIT
-    for b in data:
-        crc ^= (b << 8)
+def _make_table() -> tuple:
+    """Pré-calcula o resíduo do polinômio para cada um dos 256 bytes."""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
         for _ in range(8):
             if crc & 0x8000:
                 crc = ((crc << 1) & 0xFFFF) ^ POLY
             else:
                 crc = (crc << 1) & 0xFFFF
-    return f"{crc:04X}"
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _make_table()
+_HEX = b"0123456789ABCDEF"
+
+
+def crc16_resume(state: int, data: ByteString) -> int:
+    """Continua o CRC-16/CCITT a partir de `state` sobre `data`.
+    Como o CRC é processado da esquerda para a direita,
+    crc16_resume(crc16_resume(CRC16_INIT, a), b) == crc16_resume(CRC16_INIT, a + b).
+    """
+    data = bytes(data)
+    if _crc16_nb is not None:
+        return int(_crc16_nb(state, np.frombuffer(data, dtype=np.uint8)))
+
+    table = _CRC16_TABLE
+    crc = state
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+def crc16_hex_into(buf: bytearray, crc: int) -> None:
+    """Acrescenta `crc` a `buf` como 4 dígitos hex em MAIÚSCULAS."""
+    buf.append(_HEX[(crc >> 12) & 0xF])
+    buf.append(_HEX[(crc >> 8) & 0xF])
+    buf.append(_HEX[(crc >> 4) & 0xF])
+    buf.append(_HEX[crc & 0xF])
+
+
+def crc16_ccitt(data: ByteString) -> str:
+    """Calcula CRC-16/CCITT (polynomial 0x1021, inicial 0xFFFF).
+    Retorna string hex em MAIÚSCULAS com 4 caracteres.
+    """
+    return f"{crc16_resume(CRC16_INIT, data):04X}"
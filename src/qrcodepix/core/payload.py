@@ -1,11 +1,139 @@
-from typing import Optional, Tuple
-import unicodedata
+from functools import lru_cache
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+import os
 import re
 
-POLY = 0x1021
-INIT = 0xFFFF
+from .crc16 import CRC16_INIT, crc16_hex_into, crc16_resume
+
+# Letras latinas acentuadas (Latin-1 + Latin Extended-A) e sua letra base ASCII.
+# Equivale a NFD + remoção de diacríticos para esses caracteres.
+_ACCENTED = (
+    "ÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝ"
+    "àáâãäåçèéêëìíîïñòóôõöùúûüýÿ"
+    "ĀāĂăĄąĆćĈĉĊċČčĎďĒēĔĕĖėĘęĚěĜĝĞğĠġĢģĤĥĨĩĪīĬĭĮįİĴĵĶķĹĺĻļĽ"
+    "ľŃńŅņŇňŌōŎŏŐőŔŕŖŗŘřŚśŜŝŞşŠšŢţŤťŨũŪūŬŭŮůŰűŲųŴŵŶŷŸŹźŻżŽž"
+)
+_ACCENT_BASE = (
+    "AAAAAACEEEEIIIINOOOOOUUUUY"
+    "aaaaaaceeeeiiiinooooouuuuyy"
+    "AaAaAaCcCcCcCcDdEeEeEeEeEeGgGgGgGgHhIiIiIiIiIJjKkLlLlL"
+    "lNnNnNnOoOoOoRrRrRrSsSsSsSsTtTtUuUuUuUuUuUuWwYyYZzZzZz"
+)
+
+
+def _make_ascii_upper_table() -> dict:
+    """
+    Tabela para `str.translate` que aplica numa só passada todas as regras de
+    `normalize_text` (exceto colapsar espaços) para o intervalo U+0000–U+017F:
+    letras viram MAIÚSCULAS ASCII sem acento, espaços viram " " e os demais
+    caracteres são removidos. Códigos fora do intervalo passam intactos.
+    """
+    table = {}
+    for code in range(0x180):
+        char = chr(code)
+        if char.isascii() and (char.isdigit() or char.isupper()):
+            continue
+        if char.isascii() and char.islower():
+            table[code] = char.upper()
+        elif char.isspace():
+            table[code] = " "
+        else:
+            table[code] = None
+    for char, base in zip(_ACCENTED, _ACCENT_BASE):
+        table[ord(char)] = base.upper()
+    return table
+
+
+_TO_ASCII_UPPER = _make_ascii_upper_table()
+
+# Remove tudo que não for dígito ASCII (válida para entradas ASCII)
+_DIGITS_ONLY_TBL = str.maketrans(
+    "", "", "".join(chr(code) for code in range(128) if not "0" <= chr(code) <= "9")
+)
 
+_DEFAULT_CACHE_SIZE = 4096
+
+
+def _cache_size_from_env() -> int:
+    """
+    Tamanho do cache de normalização (QRCODEPIX_CACHE_SIZE=0 desativa).
+    Valores não inteiros ou negativos são ignorados e usa-se o padrão.
+    """
+    try:
+        size = int(os.environ.get("QRCODEPIX_CACHE_SIZE", _DEFAULT_CACHE_SIZE))
+    except ValueError:
+        return _DEFAULT_CACHE_SIZE
+    return size if size >= 0 else _DEFAULT_CACHE_SIZE
+
+
+_CACHE_SIZE = _cache_size_from_env()
+
+# Valores fixos do BR Code, já codificados
+_PAYLOAD_FORMAT = b"01"
+_POI_STATIC = b"11"
+_POI_DYNAMIC = b"12"
+_PIX_GUI = b"BR.GOV.BCB.PIX"
+_MCC = b"0000"
+_CCY_BRL = b"986"
+_COUNTRY_BR = b"BR"
+_CRC_TAG = b"6304"
+
+# Comprimentos EMV "00".."99" já formatados
+_LEN2 = tuple(f"{i:02d}".encode("ascii") for i in range(100))
+
+# Padrões pré-compilados usados nos caminhos não-ASCII
+_NON_DIGIT = re.compile(r'[^0-9]')
+# Tudo que não for letra, número ou espaço (padrão EMV)
+_NON_ALNUM_SPACE = re.compile(r'[^A-Za-z0-9\s]')
+
+
+def _key_11_digits(chave: str, only_numbers: str) -> str:
+    """CPF ou telefone sem código do país."""
+    # Verificar se é telefone ou CPF
+    # Telefones no Brasil começam com DDD (2 dígitos) seguido de 9 dígitos
+    # DDDs válidos: 11-99 (nenhum DDD começa com 0)
+    # CPFs podem começar com 0
+
+    # Se começa com 0, é CPF (DDDs não começam com 0)
+    if only_numbers[0] == '0':
+        return only_numbers
+
+    # Se a entrada original tinha formatação de CPF (. ou -), é CPF
+    if '.' in chave or '-' in chave:
+        return only_numbers
+
+    # Se o segundo dígito é 9 (celular), provavelmente é telefone
+    # Telefones celulares: (11) 9xxxx-xxxx
+    if only_numbers[2] in '987':
+        return f"+55{only_numbers}"
+
+    # Caso contrário, assumir CPF para segurança
+    return only_numbers
+
+
+def _key_13_digits(chave: str, only_numbers: str) -> str:
+    """Telefone com código do país."""
+    # Se começa com 55, é telefone com código do país
+    if only_numbers.startswith('55'):
+        return f"+{only_numbers}"
+
+    # Se já tem + no início, é telefone; senão, manter original
+    return chave
 
+
+def _key_14_digits(chave: str, only_numbers: str) -> str:
+    """CNPJ: retorna sem formatação, PRESERVA zeros à esquerda."""
+    return only_numbers
+
+
+_KEY_BY_DIGITS = {
+    11: _key_11_digits,
+    13: _key_13_digits,
+    14: _key_14_digits,
+}
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
 def normalize_pix_key(chave: str) -> str:
     """
     Normaliza a chave PIX conforme o tipo detectado.
@@ -43,48 +171,20 @@ def normalize_pix_key(chave: str) -> str:
 
     # Remove caracteres não numéricos para análise
     # IMPORTANTE: Usa string, NÃO converte para int, preservando zeros à esquerda
-    only_numbers = re.sub(r'[^0-9]', '', chave)
-
-    # Se tem 13 dígitos e começa com 55, é telefone com código do país
-    if len(only_numbers) == 13 and only_numbers.startswith('55'):
-        return f"+{only_numbers}"
-
-    # Se já tem + no início e 13 dígitos, é telefone
-    if chave.startswith('+') and len(only_numbers) == 13:
+    if chave.isascii():
+        only_numbers = chave.translate(_DIGITS_ONLY_TBL)
+    else:
+        only_numbers = _NON_DIGIT.sub('', chave)
+
+    # Classificação pelo número de dígitos (11: CPF/telefone, 13: telefone
+    # com +55, 14: CNPJ); chaves aleatórias (EVP) e outros formatos ficam como estão
+    normalize = _KEY_BY_DIGITS.get(len(only_numbers))
+    if normalize is None:
         return chave
-
-    # Se tem exatamente 11 dígitos
-    if len(only_numbers) == 11:
-        # Verificar se é telefone ou CPF
-        # Telefones no Brasil começam com DDD (2 dígitos) seguido de 9 dígitos
-        # DDDs válidos: 11-99 (nenhum DDD começa com 0)
-        # CPFs podem começar com 0
-
-        # Se começa com 0, é CPF (DDDs não começam com 0)
-        if only_numbers[0] == '0':
-            return only_numbers
-
-        # Se a entrada original tinha formatação de CPF (. ou -), é CPF
-        if '.' in chave or '-' in chave:
-            return only_numbers
-
-        # Se o segundo dígito é 9 (celular), provavelmente é telefone
-        # Telefones celulares: (11) 9xxxx-xxxx
-        if len(only_numbers) == 11 and only_numbers[2] in ['9', '8', '7']:
-            return f"+55{only_numbers}"
-
-        # Caso contrário, assumir CPF para segurança
-        return only_numbers
-
-    # Se tem 14 dígitos (CNPJ), retornar sem formatação
-    # PRESERVA zeros à esquerda
-    if len(only_numbers) == 14:
-        return only_numbers
-
-    # Para chaves aleatórias (EVP) ou outros formatos, manter original
-    return chave
+    return normalize(chave, only_numbers)
 
 
+@lru_cache(maxsize=_CACHE_SIZE)
 def normalize_text(text: str) -> str:
     """
     Normaliza texto conforme especificação do Banco Central para PIX.
@@ -104,52 +204,70 @@ def normalize_text(text: str) -> str:
     if not text:
         return ""
 
-    # Normalização NFD (Normalization Form Decomposed)
-    # Separa caracteres base dos diacríticos (á = a + ´)
-    text_nfd = unicodedata.normalize('NFD', text)
+    # Caminho rápido: acentos, filtro de caracteres e maiúsculas via tabela
+    text_upper = text.translate(_TO_ASCII_UPPER)
 
-    # Remove diacríticos (mantém apenas caracteres base)
-    # Categoria 'Mn' = Mark, Nonspacing (acentos, til, cedilha, etc.)
-    text_without_accents = ''.join(
-        char for char in text_nfd if unicodedata.category(char) != 'Mn'
-    )
+    # Se restar algo fora do ASCII, recorre à decomposição NFD completa
+    if not text_upper.isascii():
+        # Importado só aqui: o caminho comum não precisa da base Unicode
+        import unicodedata
+
+        # Normalização NFD (Normalization Form Decomposed)
+        # Separa caracteres base dos diacríticos (á = a + ´)
+        text_nfd = unicodedata.normalize('NFD', text)
+
+        # Remove diacríticos (mantém apenas caracteres base)
+        # Categoria 'Mn' = Mark, Nonspacing (acentos, til, cedilha, etc.)
+        text_without_accents = ''.join(
+            char for char in text_nfd if unicodedata.category(char) != 'Mn'
+        )
 
-    # Remove todos os caracteres que não sejam letras, números ou espaços
-    # Conforme especificação do padrão EMV
-    text_clean = re.sub(r'[^A-Za-z0-9\s]', '', text_without_accents)
+        # Remove todos os caracteres que não sejam letras, números ou espaços
+        # Conforme especificação do padrão EMV
+        text_clean = _NON_ALNUM_SPACE.sub('', text_without_accents)
 
-    # Converte para maiúsculas (padrão do PIX)
-    text_upper = text_clean.upper()
+        # Converte para maiúsculas (padrão do PIX)
+        text_upper = text_clean.upper()
 
     # Remove espaços duplicados e espaços nas extremidades
-    text_final = ' '.join(text_upper.split())
+    return ' '.join(text_upper.split())
 
-    return text_final
+
+def _normalize_and_truncate(value: str, max_bytes: int) -> bytes:
+    """
+    `normalize_text` seguido do limite de tamanho do campo, já em bytes.
+    O texto normalizado é ASCII, então truncar por caractere equivale a
+    truncar por byte.
+    """
+    return normalize_text(value)[:max_bytes].encode("ascii")
 
 
-def crc16(payload_bytes: bytes) -> str:
-    """CRC-16/CCITT (polynomial 0x1021, init 0xFFFF). Retorna 4 hex maiúsculo."""
-    crc = INIT
-    for b in payload_bytes:
-        crc ^= (b << 8)
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = ((crc << 1) ^ POLY) & 0xFFFF
-            else:
-                crc = (crc << 1) & 0xFFFF
-    return f"{crc:04X}"
+def _append_field(buf: bytearray, tag: bytes, value: bytes) -> None:
+    """Acrescenta o campo tag+len(2d)+value diretamente ao buffer."""
+    length = len(value)
+    buf += tag
+    buf += _LEN2[length] if length < 100 else b"%02d" % length
+    buf += value
 
 
-def _emv_field_bytes(tag: str, value: str) -> bytes:
-    """Retorna bytes do campo tag+len(2d em bytes)+value(utf-8)."""
-    v_bytes = value.encode("utf-8")
-    length = len(v_bytes)
-    return f"{tag}{length:02d}".encode("utf-8") + v_bytes
+def _header(point_of_initiation: bytes) -> bytes:
+    """Campos 00 e 01, iguais em todo BR Code do mesmo tipo (estático/dinâmico)."""
+    buf = bytearray()
+    # 00 - Payload Format Indicator (obrigatório, fixo "01")
+    _append_field(buf, b"00", _PAYLOAD_FORMAT)
+    # 01 - Point of Initiation Method
+    # "11" = QR estático (pode ser reutilizado)
+    # "12" = QR dinâmico (uso único)
+    _append_field(buf, b"01", point_of_initiation)
+    return bytes(buf)
 
 
-def _emv_field_str(tag: str, value: str) -> str:
-    """Auxiliar que retorna string (útil se preferir trabalhar em str)."""
-    return _emv_field_bytes(tag, value).decode("utf-8")
+# Cabeçalho fixo e o estado do CRC após processá-lo, calculados uma única vez.
+# O CRC de cada payload continua desse estado e só percorre os bytes seguintes.
+_HEADER_STATIC = _header(_POI_STATIC)
+_HEADER_DYNAMIC = _header(_POI_DYNAMIC)
+_HEADER_STATIC_CRC = crc16_resume(CRC16_INIT, _HEADER_STATIC)
+_HEADER_DYNAMIC_CRC = crc16_resume(CRC16_INIT, _HEADER_DYNAMIC)
 
 
 def build_pix_payload(
@@ -171,6 +289,51 @@ def build_pix_payload(
     - Caracteres permitidos: UTF-8 sem acentos (normalizado)
     - Limites: Nome 25 chars, Cidade 15 chars, TXID 25 chars
     """
+    return _build_pix_payload(
+        chave_pix, merchant_name, merchant_city, valor, txid, description, dynamic
+    )[0]
+
+
+def build_pix_payloads(params: Iterable[Mapping[str, Any]]) -> List[str]:
+    """
+    Constrói vários BR Codes de uma vez (ex.: folha de pagamento, cobranças em lote).
+    Cada item de `params` traz os argumentos nomeados de `build_pix_payload`;
+    o resultado segue a mesma ordem.
+    """
+    return [build_pix_payload(**kwargs) for kwargs in params]
+
+
+def _build_pix_payload(*args, **kwargs) -> Tuple[str, str]:
+    """Implementação de `build_pix_payload`; retorna (payload, crc em hex)."""
+    buf, crc_state, start = _build_payload_body(*args, **kwargs)
+    # O estado inicial já cobre o cabeçalho; processa apenas o restante
+    crc = crc16_resume(crc_state, bytes(buf[start:]))
+    return _finish_payload(buf, crc)
+
+
+def _finish_payload(buf: bytearray, crc: int) -> Tuple[str, str]:
+    """
+    Acrescenta o CRC ao payload; retorna (payload, crc em hex).
+    O hex retornado vem do inteiro `crc`, não do texto, para que quem chama
+    possa conferir o que foi gravado no buffer.
+    """
+    crc16_hex_into(buf, crc)
+    return buf.decode("utf-8"), f"{crc:04X}"
+
+
+def _build_payload_body(
+    chave_pix: str,
+    merchant_name: str,
+    merchant_city: str,
+    valor: Optional[float] = None,
+    txid: Optional[str] = None,
+    description: Optional[str] = None,
+    dynamic: bool = False,
+) -> Tuple[bytearray, int, int]:
+    """
+    Monta o payload até "6304" (sem o valor do CRC).
+    Retorna (buffer, estado do CRC após o cabeçalho, tamanho do cabeçalho).
+    """
     if not chave_pix:
         raise ValueError("chave_pix é obrigatório")
     if not merchant_name or not merchant_city:
@@ -183,92 +346,82 @@ def build_pix_payload(
     # Normalizar a chave PIX
     chave_pix_normalizada = normalize_pix_key(chave_pix)
 
-    parts = []
-
-    # 00 - Payload Format Indicator (obrigatório, fixo "01")
-    parts.append(_emv_field_bytes("00", "01"))
-
-    # 01 - Point of Initiation Method
-    # "11" = QR estático (pode ser reutilizado)
-    # "12" = QR dinâmico (uso único)
-    parts.append(_emv_field_bytes("01", "12" if dynamic else "11"))
+    # 00 e 01 - Payload Format Indicator e Point of Initiation Method
+    if dynamic:
+        header, crc_state = _HEADER_DYNAMIC, _HEADER_DYNAMIC_CRC
+    else:
+        header, crc_state = _HEADER_STATIC, _HEADER_STATIC_CRC
+    buf = bytearray(header)
 
     # 26 - Merchant Account Information (obrigatório)
     # GUI obrigatório: BR.GOV.BCB.PIX
-    mai = []
-    mai.append(_emv_field_bytes("00", "BR.GOV.BCB.PIX"))
+    mai = bytearray()
+    _append_field(mai, b"00", _PIX_GUI)
 
     # subfield 01 = chave PIX (obrigatório)
     # Chave normalizada (telefone com +55, CPF/CNPJ sem formatação, etc.)
-    mai.append(_emv_field_bytes("01", chave_pix_normalizada))
+    _append_field(mai, b"01", chave_pix_normalizada.encode("utf-8"))
 
     # subfield 02 = Informação Adicional/Descrição (opcional, máx 72 chars)
     if description:
         # Normalizar e limitar descrição
-        normalized_desc = normalize_text(description)[:72]
+        normalized_desc = _normalize_and_truncate(description, 72)
         if normalized_desc:
-            mai.append(_emv_field_bytes("02", normalized_desc))
+            _append_field(mai, b"02", normalized_desc)
 
-    mai_concat = b"".join(mai)
-    parts.append(f"26{len(mai_concat):02d}".encode("utf-8") + mai_concat)
+    _append_field(buf, b"26", mai)
 
     # 52 - Merchant Category Code (obrigatório)
     # "0000" = não especificado
-    parts.append(_emv_field_bytes("52", "0000"))
+    _append_field(buf, b"52", _MCC)
 
     # 53 - Transaction Currency (obrigatório)
     # "986" = BRL (Real brasileiro) conforme ISO 4217
-    parts.append(_emv_field_bytes("53", "986"))
+    _append_field(buf, b"53", _CCY_BRL)
 
     # 54 - Transaction Amount (condicional)
     # Formato: sem símbolo, ponto como separador decimal, ex: "10.00"
     # Obrigatório se Point of Initiation = "12" (dinâmico)
     if valor is not None:
-        amount_str = f"{valor:.2f}"
-        parts.append(_emv_field_bytes("54", amount_str))
+        _append_field(buf, b"54", f"{valor:.2f}".encode("ascii"))
 
     # 58 - Country Code (obrigatório)
     # "BR" = Brasil conforme ISO 3166-1 alpha 2
-    parts.append(_emv_field_bytes("58", "BR"))
+    _append_field(buf, b"58", _COUNTRY_BR)
 
     # 59 - Merchant Name (obrigatório, máx 25 caracteres)
     # Deve ser normalizado (sem acentos, maiúsculas)
-    normalized_name = normalize_text(merchant_name)
-    if len(normalized_name) > 25:
-        normalized_name = normalized_name[:25]
+    normalized_name = _normalize_and_truncate(merchant_name, 25)
     if not normalized_name:
         raise ValueError(
             "merchant_name não pode estar vazio após normalização")
-    parts.append(_emv_field_bytes("59", normalized_name))
+    _append_field(buf, b"59", normalized_name)
 
     # 60 - Merchant City (obrigatório, máx 15 caracteres)
     # Deve ser normalizado (sem acentos, maiúsculas)
-    normalized_city = normalize_text(merchant_city)
-    if len(normalized_city) > 15:
-        normalized_city = normalized_city[:15]
+    normalized_city = _normalize_and_truncate(merchant_city, 15)
     if not normalized_city:
         raise ValueError(
             "merchant_city não pode estar vazio após normalização")
-    parts.append(_emv_field_bytes("60", normalized_city))
+    _append_field(buf, b"60", normalized_city)
 
     # 62 - Additional Data Field Template (condicional)
     # subfield 05 = Reference Label / TXID (identificador da transação)
     # Máximo 25 caracteres alfanuméricos
     if txid:
         # Normalizar TXID para garantir apenas caracteres válidos
-        normalized_txid = normalize_text(txid)[:25]
+        normalized_txid = _normalize_and_truncate(txid, 25)
         if normalized_txid:
-            sub_62 = _emv_field_bytes("05", normalized_txid)
-            parts.append(f"62{len(sub_62):02d}".encode("utf-8") + sub_62)
+            sub_62 = bytearray()
+            _append_field(sub_62, b"05", normalized_txid)
+            _append_field(buf, b"62", sub_62)
 
     # 63 - CRC16 (obrigatório, sempre o último campo)
     # Formato: "6304" + 4 dígitos hexadecimais
     # CRC calculado sobre todo o payload incluindo "6304"
-    payload_bytes_no_crc = b"".join(parts) + b"6304"
-    crc = crc16(payload_bytes_no_crc)
-    full = payload_bytes_no_crc + crc.encode("utf-8")
+    buf += _CRC_TAG
 
-    return full.decode("utf-8")
+    return buf, crc_state, len(header)
 
 
 def generate_pix_qrcode(chave_pix: str, merchant_name: str, merchant_city: str,
@@ -276,7 +429,7 @@ def generate_pix_qrcode(chave_pix: str, merchant_name: str, merchant_city: str,
                         description: Optional[str] = None, output_path="qrcode_pix.png") -> str:
     import qrcode
 
-    payload = build_pix_payload(
+    payload, crc = _build_pix_payload(
         chave_pix=chave_pix,
         merchant_name=merchant_name,
         merchant_city=merchant_city,
@@ -284,17 +437,10 @@ def generate_pix_qrcode(chave_pix: str, merchant_name: str, merchant_city: str,
         txid=txid,
         description=description
     )
-    # sanity check: recalcula CRC e compara
-    # recalcula CRC sobre payload até '6304'
-    idx = payload.rfind("63")
-    if idx == -1:
+    # sanity check: o CRC recém-calculado deve ser o último campo (63)
+    # (removido com `python -O`)
+    if __debug__ and not payload.endswith("6304" + crc):
         raise RuntimeError("Payload mal formado (sem 63 CRC).")
-    without_crc = payload[:idx] + "6304"
-    check_crc = crc16(without_crc.encode("utf-8"))
-    given_crc = payload[idx+4: idx+8] if len(payload) >= idx+8 else None
-    if check_crc != given_crc:
-        raise RuntimeError(
-            f"CRC mismatch: calculado={check_crc} inserido={given_crc}")
 
     qr = qrcode.QRCode(version=1, box_size=10, border=4)
     qr.add_data(payload)
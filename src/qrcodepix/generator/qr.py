@@ -1,44 +1,117 @@
 """Geração do QR Code em PNG e SVG.
 Tenta usar `segno` (recomendado). Se não encontrado, faz fallback para `qrcode`.
+A biblioteca é escolhida uma única vez, na importação do módulo.
 """
-from typing import Tuple
+import io
+import os
+from functools import lru_cache
+from typing import Tuple, Union
 
 
-def save_qr_files(payload: str, filename_base: str = "pix_qr", scale: int = 8, border: int = 4) -> Tuple[str, str]:
-    png_path = f"{filename_base}.png"
-    svg_path = f"{filename_base}.svg"
+_FORMATS = ("png", "svg")
 
+
+def _write_file(path: str, data: bytes) -> None:
+    """Grava `data` em `path` direto no descritor, sem o buffer de `open()`."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
     try:
-        import segno
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 
-        qr = segno.make(payload, micro=False)
-        qr.save(png_path, scale=scale, border=border)
+@lru_cache(maxsize=64)
+def _segno_matrix(payload: str):
+    """Monta (uma vez por payload) a matriz do QR; mudar `scale` ou `border`
+    só re-rasteriza."""
+    return segno.make(payload, micro=False)
 
-        # Para SVG, multiplicar scale por 3 para garantir tamanho adequado
-        # SVG renderiza em unidades diferentes, então precisa de scale maior
-        svg_scale = scale * 3
-        qr.save(svg_path, scale=svg_scale, border=border,
-                xmldecl=False, svgclass=None)
-        return png_path, svg_path
 
-    except Exception:
-        # fallback para qrcode (pil + svg)
-        try:
-            import qrcode
-            from qrcode.image.svg import SvgImage
+def _render_with_segno(payload: str, scale: int, border: int,
+                       formats: Tuple[str, ...]) -> Tuple[bytes, ...]:
+    qr = _segno_matrix(payload)
+    rendered = []
+    for fmt in formats:
+        if fmt == "svg":
+            # Para SVG, multiplicar scale por 3 para garantir tamanho adequado
+            # SVG renderiza em unidades diferentes, então precisa de scale maior
+            options = dict(scale=scale * 3, border=border,
+                           xmldecl=False, svgclass=None)
+        else:
+            options = dict(scale=scale, border=border)
+        out = io.BytesIO()
+        qr.save(out, kind=fmt, **options)
+        rendered.append(out.getvalue())
+    return tuple(rendered)
 
+
+def _render_with_qrcode(payload: str, scale: int, border: int,
+                        formats: Tuple[str, ...]) -> Tuple[bytes, ...]:
+    rendered = []
+    for fmt in formats:
+        out = io.BytesIO()
+        if fmt == "svg":
+            qr_svg = qrcode.make(payload, image_factory=SvgImage)
+            qr_svg.save(out)
+        else:
             qr = qrcode.QRCode(border=border)
             qr.add_data(payload)
             qr.make(fit=True)
             img = qr.make_image()
-            img.save(png_path)
+            img.save(out)
+        rendered.append(out.getvalue())
+    return tuple(rendered)
 
-            qr_svg = qrcode.make(payload, image_factory=SvgImage)
-            qr_svg.save(svg_path)
 
-            return png_path, svg_path
+def _render_unavailable(payload: str, scale: int, border: int,
+                        formats: Tuple[str, ...]) -> Tuple[bytes, ...]:
+    raise RuntimeError(
+        "Nenhuma biblioteca de QR disponível. Instale 'segno' ou 'qrcode[pil] qrcode[svg]'."
+    )
+
+
+try:
+    import segno
+    _render_impl = _render_with_segno
+except ImportError:
+    # fallback para qrcode (pil + svg)
+    try:
+        import qrcode
+        from qrcode.image.svg import SvgImage
+        _render_impl = _render_with_qrcode
+    except ImportError:
+        _render_impl = _render_unavailable
+
+
+def _check_formats(formats: Union[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    # Aceita um formato sozinho ("png") além de uma sequência ("png", "svg")
+    if isinstance(formats, str):
+        formats = (formats,)
+    for fmt in formats:
+        if fmt not in _FORMATS:
+            raise ValueError(f"formato não suportado: {fmt!r} (use 'png' ou 'svg')")
+    return tuple(formats)
+
+
+def render_qr_bytes(payload: str, scale: int = 8, border: int = 4,
+                    formats: Union[str, Tuple[str, ...]] = _FORMATS) -> Tuple[bytes, ...]:
+    """Renderiza o QR do payload em memória nos formatos pedidos ("png" e/ou "svg").
+    Retorna o conteúdo de cada arquivo, na mesma ordem de `formats`.
+    """
+    return _render_impl(payload, scale, border, _check_formats(formats))
+
 
-        except Exception as exc:
-            raise RuntimeError(
-                "Nenhuma biblioteca de QR disponível. Instale 'segno' ou 'qrcode[pil] qrcode[svg]'."
-            ) from exc
+def save_qr_files(payload: str, filename_base: str = "pix_qr", scale: int = 8, border: int = 4,
+                  formats: Union[str, Tuple[str, ...]] = _FORMATS) -> Tuple[str, ...]:
+    """Grava o QR do payload nos formatos pedidos ("png" e/ou "svg").
+    Retorna os caminhos gerados, na mesma ordem de `formats`.
+    """
+    formats = _check_formats(formats)
+    paths = []
+    for fmt, data in zip(formats, _render_impl(payload, scale, border, formats)):
+        path = f"{filename_base}.{fmt}"
+        _write_file(path, data)
+        paths.append(path)
+    return tuple(paths)
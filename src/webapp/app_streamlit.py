@@ -1,141 +1,313 @@
 """
 Interface web para geração de QR Codes PIX usando Streamlit.
+
+As chamadas de widgets (st.*) ficam só dentro de main(), chamada pelo
+guard `__main__`; no topo do módulo há apenas constantes e funções,
+para que importá-lo não monte a interface.
 """
-import re
 import io
+import os
+import string
+import tempfile
+import unicodedata
 import zipfile
-import shutil
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import Optional, Tuple
 
 import streamlit as st
-from qrcodepix.core.payload import build_pix_payload
-from qrcodepix.generator.qr import save_qr_files
+from qrcodepix.core.payload import build_pix_payload, normalize_pix_key
+from qrcodepix.generator.qr import render_qr_bytes
+
+# Caracteres aceitos no email (parte local e domínio)
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+# Caracteres aceitos no valor, depois de trocar ',' por '.'
+_AMOUNT_CHARS = frozenset(string.digits + ".")
+# Dígitos da parte inteira do valor (campo 54 tem até 13 caracteres)
+_MAX_AMOUNT_WHOLE_DIGITS = 10
+
+# Nomes dos arquivos oferecidos para download (e gravados em output/)
+_PNG_NAME = "pix_qr.png"
+_SVG_NAME = "pix_qr.svg"
+
+# Tipos de chave PIX oferecidos no seletor. Esta tabela e a de exemplos ficam
+# no topo do módulo só por legibilidade: o Streamlit reexecuta o script
+# inteiro a cada rerun, então elas são recriadas do mesmo jeito.
+_KEY_TYPES = ("Email", "Telefone", "CPF/CNPJ", "Chave Aleatória (EVP)")
+
+# Exemplos e placeholders baseados no tipo de chave
+_EXAMPLES_MAP = {
+    "Email": {
+        "placeholder": "seuemail@exemplo.com",
+        "example": "📧 **Exemplo:** joao.silva@gmail.com, maria@empresa.com.br",
+        "help": "Digite o endereço de email cadastrado como chave PIX"
+    },
+    "Telefone": {
+        "placeholder": "+5511999999999",
+        "example": "📱 **Exemplos:** +5511987654321, +5521912345678, 11987654321",
+        "help": "Digite o telefone com código do país (+55) ou apenas com DDD"
+    },
+    "CPF/CNPJ": {
+        "placeholder": "12345678900",
+        "example": "🆔 **Exemplos CPF:** 123.456.789-00 ou 12345678900\n\n**Exemplos CNPJ:** 12.345.678/0001-90 ou 12345678000190",
+        "help": "Digite o CPF ou CNPJ com ou sem formatação"
+    },
+    "Chave Aleatória (EVP)": {
+        "placeholder": "123e4567-e89b-12d3-a456-426614174000",
+        "example": "🔑 **Exemplo:** 123e4567-e89b-12d3-a456-426614174000\n\nChave aleatória gerada pelo seu banco no formato UUID",
+        "help": "Cole a chave aleatória (EVP) fornecida pelo seu banco"
+    }
+}
+_EMPTY_EXAMPLE = {}
+
+
+def validate_cpf_cnpj(key: str) -> bool:
+    """Valida o formato de CPF (11 dígitos) ou CNPJ (14 dígitos)."""
+    count = 0
+    for ch in key:
+        if '0' <= ch <= '9':
+            count += 1
+            if count > 14:
+                return False
+    return count == 11 or count == 14
 
 
-def validate_cpf(cpf: str) -> bool:
-    """Valida o formato do CPF."""
-    cpf = re.sub(r'[^0-9]', '', cpf)
-    return len(cpf) == 11
+def validate_evp(key: str) -> bool:
+    """Valida o formato da chave aleatória (EVP)."""
+    return len(key) >= 20
 
 
 def validate_phone(phone: str) -> bool:
     """Valida o formato do telefone."""
-    phone = re.sub(r'[^0-9+]', '', phone)
-    return len(phone) >= 11 and len(phone) <= 14
+    # Conta dígitos e '+' sem montar a string limpa; para assim que passar de 14
+    count = 0
+    for ch in phone:
+        if '0' <= ch <= '9' or ch == '+':
+            count += 1
+            if count > 14:
+                return False
+    return count >= 11
 
 
 def validate_email(email: str) -> bool:
     """Valida o formato do email."""
-    return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email))
+    # usuario@dominio.tld, com TLD de 2+ letras; varredura linear, sem regex
+    local, _, domain = email.rpartition('@')
+    if not local or not domain:
+        return False
+    dot = domain.rfind('.')
+    if dot < 1 or len(domain) - dot - 1 < 2:
+        return False
+    return (set(local) <= _EMAIL_LOCAL_CHARS
+            and set(domain) <= _EMAIL_DOMAIN_CHARS
+            and set(domain[dot + 1:]) <= _ASCII_LETTERS)
 
 
 def validate_amount(amount: str) -> bool:
-    """Valida o formato do valor monetário."""
+    """Valida o formato do valor monetário (ex: 10, 10.5, 10,50)."""
     if not amount:
         return True
-    try:
-        value = float(amount.replace(',', '.'))
-        return value > 0 and len(str(value).split('.')[-1]) <= 2
-    except ValueError:
+    value_str = amount.replace(',', '.').strip()
+    if not value_str.isascii():
+        # Dígitos de outros sistemas (ex: fullwidth "１０") viram ASCII, como em float()
+        value_str = ''.join(str(unicodedata.decimal(ch, ch)) for ch in value_str)
+    if not set(value_str) <= _AMOUNT_CHARS:
         return False
+    whole, _, frac = value_str.partition('.')
+    if '.' in frac or len(frac) > 2:
+        return False
+    # Campo 54 do BR Code: no máximo 13 caracteres ("9999999999.99")
+    if len(whole.lstrip('0')) > _MAX_AMOUNT_WHOLE_DIGITS:
+        return False
+    # Pelo menos um dígito diferente de zero (valor maior que zero)
+    return (whole + frac).strip('0') != ''
 
 
-def make_zip_bytes(png_path: Path, svg_path: Path) -> bytes:
+def make_zip_bytes(png_name: str, png_bytes: bytes, svg_name: str, svg_bytes: bytes) -> bytes:
     """Cria um arquivo ZIP com PNG e SVG."""
+    # PNG já é comprimido: vai sem compressão. SVG é XML e comprime bem
+    # mesmo no nível 1, bem mais barato que o padrão (6)
     buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(png_path, arcname=png_path.name)
-        zf.write(svg_path, arcname=svg_path.name)
-    buf.seek(0)
-    return buf.read()
-
-
-def generate_qr(payload: str, scale: int = 8) -> Tuple[Path, Path]:
-    """Gera arquivos QR code PNG e SVG."""
-    with TemporaryDirectory() as tmpdir:
-        base = Path(tmpdir) / "pix_qr"
-        try:
-            png_path, svg_path = save_qr_files(
-                payload, filename_base=str(base), scale=scale)
-
-            # Converter os caminhos retornados para objetos Path
-            png_path = Path(png_path)
-            svg_path = Path(svg_path)
-
-            # Copiar arquivos para um local persistente
-            output_dir = Path("output").resolve()
-            output_dir.mkdir(exist_ok=True)
-            persistent_png = output_dir / png_path.name
-            persistent_svg = output_dir / svg_path.name
-
-            # Usar shutil.copy2 para copiar arquivos entre diferentes filesystems
-            shutil.copy2(str(png_path), str(persistent_png))
-            shutil.copy2(str(svg_path), str(persistent_svg))
-
-            return persistent_png, persistent_svg
-        except Exception as e:
-            st.error(f"Erro ao gerar QR: {str(e)}")
-            st.stop()
-
-
-def show_qr_downloads(png_path: Path, svg_path: Path) -> None:
-    """Exibe o QR code e cria botões de download."""
+    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=1) as zf:
+        zf.writestr(png_name, png_bytes, compress_type=zipfile.ZIP_STORED)
+        zf.writestr(svg_name, svg_bytes)
+    return buf.getvalue()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Grava via arquivo temporário + rename: outra sessão nunca vê o arquivo pela metade."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        # mkstemp cria com 0600; mantém a permissão usual de save_qr_files
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Não deixa o temporário para trás se a escrita ou o rename falhar
+        os.unlink(tmp_path)
+        raise
+
+
+def save_output_copy(png_bytes: bytes, svg_bytes: bytes) -> None:
+    """Grava a última geração em `output/` (cópia local; os downloads não dependem dela)."""
+    output_dir = Path("output").resolve()
+    output_dir.mkdir(exist_ok=True)
+    _write_atomic(output_dir / _PNG_NAME, png_bytes)
+    _write_atomic(output_dir / _SVG_NAME, svg_bytes)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _render_qr_bytes(payload: str, scale: int) -> Tuple[bytes, bytes]:
+    """
+    Renderiza o QR em memória e devolve (png_bytes, svg_bytes).
+    Memoizado por (payload, scale). Não passa por arquivos: o cache é
+    compartilhado entre sessões, e um caminho fixo poderia ser sobrescrito
+    por outra sessão entre a escrita e a leitura.
+    """
+    return render_qr_bytes(payload, scale=scale)
+
+
+def generate_qr(payload: str, scale: int = 8) -> Tuple[bytes, bytes]:
+    """Gera o QR code em PNG e SVG e atualiza a cópia em `output/`."""
     try:
-        from PIL import Image
-        img = Image.open(png_path)
-        st.image(img, caption="QR PIX (PNG)", width='stretch')
-    except ImportError:
-        st.info("PNG gerado — não foi possível exibir (Pillow ausente).")
+        png_bytes, svg_bytes = _render_qr_bytes(payload, scale)
+    except Exception as e:
+        st.error(f"Erro ao gerar QR: {str(e)}")
+        st.stop()
+    try:
+        save_output_copy(png_bytes, svg_bytes)
+    except OSError as e:
+        # Só a cópia local falhou; o QR e os downloads seguem normalmente
+        st.warning(f"Não foi possível gravar a cópia em output/: {str(e)}")
+    return png_bytes, svg_bytes
 
-    with open(png_path, "rb") as f:
-        st.download_button("Baixar PNG", data=f.read(),
-                           file_name=png_path.name, mime="image/png")
 
-    with open(svg_path, "rb") as f:
-        st.download_button("Baixar SVG", data=f.read(),
-                           file_name=svg_path.name, mime="image/svg+xml")
+def show_qr_downloads(png_bytes: bytes, svg_bytes: bytes, png_name: str, svg_name: str) -> None:
+    """Exibe o QR code e cria botões de download."""
+    # st.image aceita os bytes do PNG direto, sem decodificar com Pillow
+    st.image(png_bytes, caption="QR PIX (PNG)", width='stretch')
+
+    st.download_button("Baixar PNG", data=png_bytes,
+                       file_name=png_name, mime="image/png")
 
-    zip_bytes = make_zip_bytes(png_path, svg_path)
+    st.download_button("Baixar SVG", data=svg_bytes,
+                       file_name=svg_name, mime="image/svg+xml")
+
+    zip_bytes = make_zip_bytes(png_name, png_bytes, svg_name, svg_bytes)
     st.download_button("Baixar ZIP (PNG + SVG)", data=zip_bytes,
                        file_name="pix_qr_files.zip", mime="application/zip")
 
 
-def validate_form_input(key: str, name: str, city: str, amount: Optional[str]) -> None:
+# Validador e mensagem de erro para cada tipo de chave do seletor
+_VALIDATORS = {
+    "Email": (validate_email, "Formato de email inválido"),
+    "Telefone": (validate_phone,
+                 "Formato de telefone inválido. Use: +5511999999999 ou 11999999999"),
+    "CPF/CNPJ": (validate_cpf_cnpj, "Formato de CPF/CNPJ inválido"),
+    "Chave Aleatória (EVP)": (validate_evp, "Formato EVP inválido"),
+}
+
+def canonical_pix_key(key: str, key_type: str) -> str:
+    """
+    Reescreve a chave numa forma que `normalize_pix_key` lê como o tipo escolhido.
+    A biblioteca deduz o tipo pela própria chave: sem isso, o CPF 11987654321
+    seria codificado como o telefone +5511987654321.
+    - CPF (11 dígitos): formatado como ###.###.###-##
+    - Telefone sem '+' (11 dígitos, ou 13 começando com 55): prefixado com '+'/'+55'
+    Os demais tipos (e formatos) ficam como estão.
+    """
+    key = key.strip()
+    if key_type == "CPF/CNPJ":
+        digits = ''.join(ch for ch in key if '0' <= ch <= '9')
+        if len(digits) == 11:
+            return f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}"
+    elif key_type == "Telefone" and '+' not in key:
+        digits = ''.join(ch for ch in key if '0' <= ch <= '9')
+        if len(digits) == 11:
+            return f"+55{digits}"
+        if len(digits) == 13 and digits.startswith('55'):
+            return f"+{digits}"
+    return key
+
+
+# Ainda assim, recusa chaves que `normalize_pix_key` codificaria como outro tipo.
+# Cada verificação recebe (chave canônica, chave normalizada)
+_ENCODED_AS_SELECTED = {
+    "Telefone": (lambda key, norm: norm.startswith('+'),
+                 "Este número não seria lido como telefone. Informe com +55 (ex: +5511333334444)"),
+    "CPF/CNPJ": (lambda key, norm: norm.isdigit(),
+                 "Este número não seria lido como CPF/CNPJ. Confira a chave"),
+    "Chave Aleatória (EVP)": (lambda key, norm: norm == key,
+                              "Esta chave aleatória seria alterada na normalização. Confira a chave EVP"),
+}
+
+
+def key_encoding_error(key: str, key_type: str) -> Optional[str]:
+    """Mensagem de erro se a chave não seria codificada como `key_type`; senão None."""
+    check = _ENCODED_AS_SELECTED.get(key_type)
+    if check is None:
+        return None
+    encoded_as, message = check
+    canonical = canonical_pix_key(key, key_type)
+    return None if encoded_as(canonical, normalize_pix_key(canonical)) else message
+
+
+def validate_form_input(key: str, name: str, city: str, amount: Optional[str],
+                        key_type: str) -> None:
     """Valida todos os campos do formulário."""
     if not key or not name or not city:
         st.error("Campos obrigatórios: chave, nome e cidade.")
         st.stop()
 
-    # Validar chave PIX
-    if '@' in key:
-        if not validate_email(key):
-            st.error("Formato de email inválido")
-            st.stop()
-    elif key.isdigit() or '+' in key:
-        if not validate_phone(key):
-            st.error(
-                "Formato de telefone inválido. Use: +5511999999999 ou 11999999999")
-            st.stop()
-    elif re.sub(r'[^0-9]', '', key).isdigit():
-        if not validate_cpf(key):
-            st.error("Formato de CPF inválido")
-            st.stop()
+    # Validar chave PIX conforme o tipo escolhido no seletor
+    validator, message = _VALIDATORS[key_type]
+    if not validator(key):
+        st.error(message)
+        st.stop()
+
+    encoding_error = key_encoding_error(key, key_type)
+    if encoding_error:
+        st.error(encoding_error)
+        st.stop()
 
     if amount and not validate_amount(amount):
         st.error("Valor inválido. Use formato: 10.00")
         st.stop()
 
 
-def process_form(key: str, name: str, city: str, amount: str, txid: str, desc: str, scale: int) -> None:
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_payload(chave_pix: str, merchant_name: str, merchant_city: str,
+                    valor: Optional[float], txid: Optional[str],
+                    description: Optional[str], dynamic: bool = False) -> str:
+    """
+    `build_pix_payload` memoizado: reenvios idênticos não refazem o BR Code.
+    Usa `st.cache_data` porque o Streamlit reexecuta o script a cada rerun,
+    o que recriaria um `lru_cache` declarado aqui (e o esvaziaria).
+    """
+    return build_pix_payload(
+        chave_pix=chave_pix,
+        merchant_name=merchant_name,
+        merchant_city=merchant_city,
+        valor=valor,
+        txid=txid,
+        description=description,
+        dynamic=dynamic,
+    )
+
+
+def process_form(key: str, name: str, city: str, amount: str, txid: str, desc: str, scale: int,
+                 key_type: str) -> None:
     """Processa o formulário e gera o QR code."""
-    validate_form_input(key, name, city, amount)
+    validate_form_input(key, name, city, amount, key_type)
+    key = canonical_pix_key(key, key_type)
 
     try:
         amount_norm = float(amount.replace(',', '.')) if amount else None
 
-        payload = build_pix_payload(
+        payload = _cached_payload(
             chave_pix=key,
             merchant_name=name,
             merchant_city=city,
@@ -151,8 +323,8 @@ def process_form(key: str, name: str, city: str, amount: str, txid: str, desc: s
         st.stop()
 
     with st.spinner("Gerando QR..."):
-        png_path, svg_path = generate_qr(payload, scale=scale)
-        show_qr_downloads(png_path, svg_path)
+        png_bytes, svg_bytes = generate_qr(payload, scale=scale)
+        show_qr_downloads(png_bytes, svg_bytes, _PNG_NAME, _SVG_NAME)
         st.success("QR Code gerado com sucesso!")
 
 
@@ -164,37 +336,13 @@ def main():
     # Seletor de tipo de chave PIX (fora do formulário para atualização dinâmica)
     key_type = st.selectbox(
         "Tipo de Chave PIX",
-        options=["Email", "Telefone", "CPF/CNPJ", "Chave Aleatória (EVP)"],
+        options=_KEY_TYPES,
         index=0,
         help="Selecione o tipo da sua chave PIX"
     )
 
-    # Exemplos e placeholders baseados no tipo de chave
-    examples_map = {
-        "Email": {
-            "placeholder": "seuemail@exemplo.com",
-            "example": "📧 **Exemplo:** joao.silva@gmail.com, maria@empresa.com.br",
-            "help": "Digite o endereço de email cadastrado como chave PIX"
-        },
-        "Telefone": {
-            "placeholder": "+5511999999999",
-            "example": "📱 **Exemplos:** +5511987654321, +5521912345678, 11987654321",
-            "help": "Digite o telefone com código do país (+55) ou apenas com DDD"
-        },
-        "CPF/CNPJ": {
-            "placeholder": "12345678900",
-            "example": "🆔 **Exemplos CPF:** 123.456.789-00 ou 12345678900\n\n**Exemplos CNPJ:** 12.345.678/0001-90 ou 12345678000190",
-            "help": "Digite o CPF ou CNPJ com ou sem formatação"
-        },
-        "Chave Aleatória (EVP)": {
-            "placeholder": "123e4567-e89b-12d3-a456-426614174000",
-            "example": "🔑 **Exemplo:** 123e4567-e89b-12d3-a456-426614174000\n\nChave aleatória gerada pelo seu banco no formato UUID",
-            "help": "Cole a chave aleatória (EVP) fornecida pelo seu banco"
-        }
-    }
-
     # Mostrar exemplo do tipo de chave selecionado
-    current_example = examples_map.get(key_type, {})
+    current_example = _EXAMPLES_MAP.get(key_type, _EMPTY_EXAMPLE)
     if current_example.get("example"):
         st.info(current_example["example"])
 
@@ -230,7 +378,7 @@ def main():
         submitted = st.form_submit_button("Gerar QR Code PIX")
 
     if submitted:
-        process_form(key, name, city, amount, txid, desc, scale)
+        process_form(key, name, city, amount, txid, desc, scale, key_type)
 
 
 if __name__ == "__main__":
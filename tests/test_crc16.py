@@ -0,0 +1,59 @@
+"""
+Testes unitários para o cálculo de CRC-16/CCITT.
+"""
+import random
+import unittest
+from unittest import mock
+from qrcodepix.core import crc16
+from qrcodepix.core.crc16 import CRC16_INIT, crc16_ccitt, crc16_hex_into, crc16_resume
+
+try:
+    import numpy as np
+    from qrcodepix.core._crc16_numba import _crc16_nb
+except ImportError:
+    _crc16_nb = None
+
+
+class TestCrc16(unittest.TestCase):
+    def test_check_value(self):
+        """Testa o valor de verificação padrão do CRC-16/CCITT-FALSE."""
+        self.assertEqual(crc16_ccitt(b"123456789"), "29B1")
+
+    def test_empty(self):
+        """Testa que entrada vazia retorna o valor inicial."""
+        self.assertEqual(crc16_ccitt(b""), "FFFF")
+
+    def test_accepts_bytearray(self):
+        """Testa que bytearray e bytes produzem o mesmo CRC."""
+        data = b"00020126360014BR.GOV.BCB.PIX6304"
+        self.assertEqual(crc16_ccitt(bytearray(data)), crc16_ccitt(data))
+
+    def test_resume(self):
+        """Testa que o CRC pode continuar a partir de um estado salvo."""
+        state = crc16_resume(CRC16_INIT, b"1234")
+        self.assertEqual(crc16_resume(state, b"56789"), 0x29B1)
+
+    def test_hex_into(self):
+        """Testa a escrita do CRC em hex direto no buffer."""
+        buf = bytearray(b"6304")
+        crc16_hex_into(buf, 0x0A1F)
+        self.assertEqual(buf, b"63040A1F")
+
+
+@unittest.skipIf(_crc16_nb is None, "numba não instalado")
+class TestCrc16Numba(unittest.TestCase):
+    def test_matches_table(self):
+        """Testa que o kernel numba e a tabela dão o mesmo CRC."""
+        rng = random.Random(1234)
+        for _ in range(200):
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(64)))
+            state = rng.choice((CRC16_INIT, rng.randrange(0x10000)))
+            # Força o caminho da tabela mesmo com QRCODEPIX_NUMBA=1
+            with mock.patch.object(crc16, "_crc16_nb", None):
+                expected = crc16_resume(state, data)
+            got = _crc16_nb(state, np.frombuffer(data, dtype=np.uint8))
+            self.assertEqual(int(got), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@
 Testes unitários para o gerador de QR Code PIX.
 """
 import unittest
-from qrcodepix.core.payload import build_pix_payload
+from qrcodepix.core.payload import (
+    build_pix_payload, build_pix_payloads, normalize_pix_key, normalize_text,
+)
 
 
 class TestPixPayload(unittest.TestCase):
@@ -92,5 +94,120 @@ class TestPixPayload(unittest.TestCase):
         self.assertIn("0112", payload)
 
 
+class TestNormalizePixKey(unittest.TestCase):
+    def test_phone(self):
+        """Testa telefone com e sem código do país."""
+        self.assertEqual(normalize_pix_key("11999999999"), "+5511999999999")
+        self.assertEqual(normalize_pix_key("5511999999999"), "+5511999999999")
+        self.assertEqual(normalize_pix_key("+5511999999999"), "+5511999999999")
+        self.assertEqual(normalize_pix_key(" 11999999999 "), "+5511999999999")
+
+    def test_cpf_keeps_leading_zeros(self):
+        """Testa CPF sem formatação, preservando zeros à esquerda."""
+        self.assertEqual(normalize_pix_key("012.345.678-90"), "01234567890")
+        self.assertEqual(normalize_pix_key("000.000.001-91"), "00000000191")
+        self.assertEqual(normalize_pix_key("11333334444"), "11333334444")
+
+    def test_cnpj(self):
+        """Testa CNPJ sem formatação, preservando zeros à esquerda."""
+        self.assertEqual(normalize_pix_key("00.000.000/0001-00"), "00000000000100")
+        self.assertEqual(normalize_pix_key("12.345.678/0001-90"), "12345678000190")
+
+    def test_13_digits_without_country_code(self):
+        """Testa que 13 dígitos sem o prefixo 55 ficam como estão."""
+        self.assertEqual(normalize_pix_key("1234567890123"), "1234567890123")
+
+    def test_email_lowercased(self):
+        """Testa que email vira minúsculas."""
+        self.assertEqual(normalize_pix_key("Teste@Email.COM"), "teste@email.com")
+
+    def test_evp_unchanged(self):
+        """Testa que a chave aleatória (EVP) passa intacta."""
+        evp = "123e4567-e89b-12d3-a456-426614174000"
+        self.assertEqual(normalize_pix_key(evp), evp)
+
+    def test_non_ascii_separators(self):
+        """Testa chaves com separadores não-ASCII (travessão, hífen não separável)."""
+        self.assertEqual(normalize_pix_key("123.456.789\u201309"), "12345678909")
+        self.assertEqual(normalize_pix_key("(11) 99999\u20119999"), "+5511999999999")
+
+    def test_empty(self):
+        """Testa chave vazia."""
+        self.assertEqual(normalize_pix_key(""), "")
+
+
+class TestNormalizeText(unittest.TestCase):
+    def test_accented_latin(self):
+        """Testa remoção de acentos em letras latinas."""
+        self.assertEqual(normalize_text("Capitão Poço"), "CAPITAO POCO")
+        self.assertEqual(normalize_text("ÀÉÎÕÜ çñ ÿ"), "AEIOU CN Y")
+        self.assertEqual(normalize_text("Łódź"), "ODZ")
+
+    def test_letters_without_base_are_dropped(self):
+        """Testa que letras sem forma decomposta (ß, Ø, ª) são removidas."""
+        self.assertEqual(normalize_text("Straße Øster ªb"), "STRAE STER B")
+
+    def test_special_chars_removed(self):
+        """Testa remoção de pontuação e símbolos."""
+        self.assertEqual(
+            normalize_text("Pagamento nº 123 - Referência"),
+            "PAGAMENTO N 123 REFERENCIA",
+        )
+
+    def test_whitespace_collapsed(self):
+        """Testa que NBSP, tab e espaços repetidos viram um único espaço."""
+        self.assertEqual(normalize_text("  José  da   Silva "), "JOSE DA SILVA")
+        self.assertEqual(normalize_text("SAO\u00a0PAULO\tSP\n"), "SAO PAULO SP")
+
+    def test_combining_mark(self):
+        """Testa entrada já decomposta (letra + acento combinante)."""
+        self.assertEqual(normalize_text("Jose\u0301 Sa\u0303o"), "JOSE SAO")
+
+    def test_non_latin(self):
+        """Testa que caracteres fora do alfabeto latino são removidos."""
+        self.assertEqual(normalize_text("Ελλάδα 123"), "123")
+        self.assertEqual(normalize_text("東京 1"), "1")
+
+    def test_empty(self):
+        """Testa texto vazio."""
+        self.assertEqual(normalize_text(""), "")
+
+
+class TestPixPayloadBatch(unittest.TestCase):
+    def test_known_payloads(self):
+        """Testa o lote contra payloads conhecidos (com CRC), na mesma ordem."""
+        params = [
+            dict(chave_pix="teste@email.com", merchant_name="LOJA TESTE",
+                 merchant_city="SAO PAULO", valor=10.0),
+            dict(chave_pix="123.456.789-09", merchant_name="José da Silva",
+                 merchant_city="São Paulo", txid="REF123", dynamic=True),
+            dict(chave_pix="11999999999", merchant_name="LOJA & CIA",
+                 merchant_city="RIO DE JANEIRO", description="Pagamento"),
+        ]
+        self.assertEqual(build_pix_payloads(params), [
+            "00020101021126370014BR.GOV.BCB.PIX0115teste@email.com"
+            "520400005303986540510.005802BR5910LOJA TESTE6009SAO PAULO63045BAB",
+            "00020101021226330014BR.GOV.BCB.PIX011112345678909"
+            "5204000053039865802BR5913JOSE DA SILVA6009SAO PAULO62100506REF1236304FE70",
+            "00020101021126490014BR.GOV.BCB.PIX0114+55119999999990209PAGAMENTO"
+            "5204000053039865802BR5908LOJA CIA6014RIO DE JANEIRO63045F0D",
+        ])
+
+    def test_invalid_item_raises(self):
+        """Testa que um item inválido no lote propaga o ValueError."""
+        params = [
+            dict(chave_pix="teste@email.com", merchant_name="LOJA TESTE",
+                 merchant_city="SAO PAULO"),
+            dict(chave_pix="teste@email.com", merchant_name="LOJA TESTE",
+                 merchant_city="SAO PAULO", valor=-1.0),
+        ]
+        with self.assertRaises(ValueError):
+            build_pix_payloads(params)
+
+    def test_empty_batch(self):
+        """Testa lote vazio."""
+        self.assertEqual(build_pix_payloads([]), [])
+
+
 if __name__ == "__main__":
     unittest.main()
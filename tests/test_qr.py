@@ -0,0 +1,57 @@
+"""
+Testes unitários para a geração dos arquivos de QR Code.
+"""
+import os
+import tempfile
+import unittest
+from qrcodepix.core.payload import build_pix_payload
+from qrcodepix.generator.qr import render_qr_bytes, save_qr_files
+
+PAYLOAD = build_pix_payload(
+    chave_pix="teste@email.com",
+    merchant_name="LOJA TESTE",
+    merchant_city="SAO PAULO",
+    valor=10.0,
+)
+
+
+class TestRenderQrBytes(unittest.TestCase):
+    def test_png_and_svg(self):
+        """Testa que os bytes gerados são um PNG e um SVG."""
+        png_bytes, svg_bytes = render_qr_bytes(PAYLOAD)
+        self.assertTrue(png_bytes.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertIn(b"<svg", svg_bytes[:200])
+
+    def test_single_format_str(self):
+        """Testa que um formato passado como str é aceito."""
+        (png_bytes,) = render_qr_bytes(PAYLOAD, formats="png")
+        self.assertTrue(png_bytes.startswith(b"\x89PNG"))
+
+    def test_unknown_format(self):
+        """Testa formato não suportado."""
+        with self.assertRaises(ValueError):
+            render_qr_bytes(PAYLOAD, formats=("gif",))
+
+
+class TestSaveQrFiles(unittest.TestCase):
+    def test_only_png(self):
+        """Testa que apenas o PNG é gravado quando pedido."""
+        with tempfile.TemporaryDirectory() as tmp:
+            base = os.path.join(tmp, "pix_qr")
+            paths = save_qr_files(PAYLOAD, filename_base=base, formats=("png",))
+            self.assertEqual(paths, (base + ".png",))
+            self.assertEqual(os.listdir(tmp), ["pix_qr.png"])
+
+    def test_files_match_rendered_bytes(self):
+        """Testa que os arquivos gravados têm o mesmo conteúdo de render_qr_bytes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = save_qr_files(PAYLOAD, filename_base=os.path.join(tmp, "pix_qr"))
+            contents = []
+            for path in paths:
+                with open(path, "rb") as f:
+                    contents.append(f.read())
+            self.assertEqual(tuple(contents), render_qr_bytes(PAYLOAD))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Testes unitários para as validações da interface Streamlit.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "webapp"))
+
+from app_streamlit import (
+    canonical_pix_key, key_encoding_error, validate_amount, validate_cpf_cnpj, validate_evp,
+)
+
+
+class TestValidateAmount(unittest.TestCase):
+    def test_empty_is_optional(self):
+        """Testa que valor vazio é aceito (campo opcional)."""
+        self.assertTrue(validate_amount(""))
+
+    def test_valid_amounts(self):
+        """Testa formatos aceitos, com ponto ou vírgula."""
+        for amount in ("10", "10.5", "10,50", ".5", "5.", " 7 ", "0,01", "9999999999.99"):
+            with self.subTest(amount=amount):
+                self.assertTrue(validate_amount(amount))
+
+    def test_unicode_digits(self):
+        """Testa dígitos fullwidth e arábico-índicos, aceitos como em float()."""
+        self.assertTrue(validate_amount("１０"))
+        self.assertTrue(validate_amount("١٢.٥"))
+
+    def test_zero(self):
+        """Testa que zero não é um valor válido."""
+        for amount in ("0", "0.00", "000", "."):
+            with self.subTest(amount=amount):
+                self.assertFalse(validate_amount(amount))
+
+    def test_not_a_plain_number(self):
+        """Testa que formas aceitas por float() mas que não são valores são recusadas."""
+        for amount in ("1e2", "inf", "nan", "-1", "+5", "1_000", "1.2.3", "abc", "  "):
+            with self.subTest(amount=amount):
+                self.assertFalse(validate_amount(amount))
+
+    def test_too_many_decimals(self):
+        """Testa que mais de 2 casas decimais são recusadas."""
+        self.assertFalse(validate_amount("10.505"))
+        self.assertFalse(validate_amount("1.000"))
+
+    def test_too_long(self):
+        """Testa o limite do campo 54 (parte inteira com até 10 dígitos)."""
+        self.assertFalse(validate_amount("10000000000"))
+        self.assertTrue(validate_amount("0000000000001"))
+        self.assertFalse(validate_amount("1" * 400))
+        self.assertFalse(validate_amount("9" * 5000))
+
+
+class TestKeyValidators(unittest.TestCase):
+    def test_cpf_cnpj(self):
+        """Testa CPF (11 dígitos) e CNPJ (14 dígitos), com ou sem formatação."""
+        for key in ("123.456.789-00", "12345678900", "12.345.678/0001-90", "12345678000190"):
+            with self.subTest(key=key):
+                self.assertTrue(validate_cpf_cnpj(key))
+        for key in ("123.456", "123456789001", "123456789012345", ""):
+            with self.subTest(key=key):
+                self.assertFalse(validate_cpf_cnpj(key))
+
+    def test_evp(self):
+        """Testa o tamanho mínimo da chave aleatória."""
+        self.assertTrue(validate_evp("123e4567-e89b-12d3-a456-426614174000"))
+        self.assertFalse(validate_evp("abc"))
+
+
+class TestCanonicalPixKey(unittest.TestCase):
+    def test_cpf_gets_formatted(self):
+        """Testa que CPF de 11 dígitos é formatado para não virar telefone."""
+        self.assertEqual(canonical_pix_key("11987654321", "CPF/CNPJ"), "119.876.543-21")
+        self.assertEqual(canonical_pix_key("123.456.789-00", "CPF/CNPJ"), "123.456.789-00")
+
+    def test_cnpj_unchanged(self):
+        """Testa que CNPJ fica como digitado."""
+        self.assertEqual(canonical_pix_key("12.345.678/0001-90", "CPF/CNPJ"), "12.345.678/0001-90")
+
+    def test_phone_gets_country_code(self):
+        """Testa que telefone sem '+' ganha o código do país."""
+        self.assertEqual(canonical_pix_key("11333334444", "Telefone"), "+5511333334444")
+        self.assertEqual(canonical_pix_key("(11) 98765-4321", "Telefone"), "+5511987654321")
+        self.assertEqual(canonical_pix_key("5511333334444", "Telefone"), "+5511333334444")
+        self.assertEqual(canonical_pix_key("+55 11 98765-4321", "Telefone"), "+55 11 98765-4321")
+
+    def test_other_types_unchanged(self):
+        """Testa que email e EVP não são alterados (exceto espaços nas pontas)."""
+        self.assertEqual(canonical_pix_key(" a@b.com ", "Email"), "a@b.com")
+        evp = "123e4567-e89b-12d3-a456-426614174000"
+        self.assertEqual(canonical_pix_key(evp, "Chave Aleatória (EVP)"), evp)
+
+
+class TestKeyEncodingError(unittest.TestCase):
+    def test_selected_type_is_kept(self):
+        """Testa chaves que, após a forma canônica, mantêm o tipo escolhido."""
+        self.assertIsNone(key_encoding_error("11987654321", "CPF/CNPJ"))
+        self.assertIsNone(key_encoding_error("11333334444", "Telefone"))
+        self.assertIsNone(key_encoding_error("123e4567-e89b-12d3-a456-426614174000",
+                                             "Chave Aleatória (EVP)"))
+        self.assertIsNone(key_encoding_error("a@b.com", "Email"))
+
+    def test_phone_without_country_code(self):
+        """Testa telefone que a biblioteca não codificaria com '+'."""
+        self.assertIsNotNone(key_encoding_error("551133334444", "Telefone"))
+
+    def test_evp_changed_by_normalization(self):
+        """Testa EVP com 11 dígitos, que a normalização reduziria a um CPF."""
+        self.assertIsNotNone(key_encoding_error("aaaaaaa1-aaaa-aaaa-aaa1-aaa123456789",
+                                                "Chave Aleatória (EVP)"))
+
+
+if __name__ == "__main__":
+    unittest.main()